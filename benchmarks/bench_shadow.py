@@ -0,0 +1,137 @@
+"""Compare /predict latency with shadow scoring disabled and enabled.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_shadow.py
+
+The API is served by a real uvicorn server on a local port, so responses go
+back to the client before background tasks run, exactly as in production.
+Several client threads send requests concurrently. Baseline and shadow blocks
+are interleaved over a number of rounds, alternating which goes first, and the
+shadow overhead at p50, p95 and p99 is reported against the round-to-round
+spread of the baseline at the same percentile.
+
+Two synthetic random forests trained on different data stand in for the
+primary and shadow models so the benchmark does not depend on the trained
+pickle being present, and so their agreement rate is meaningful.
+"""
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+import uvicorn
+from sklearn.ensemble import RandomForestClassifier
+
+from src.api.main import app
+from src.api.routers import predict
+from src.utils.model_experiments import ModelRouter, ShadowEvaluator
+
+ROUNDS = 8
+REQUESTS_PER_BLOCK = 200
+CLIENTS = 4
+PERCENTILES = (50, 95, 99)
+
+PAYLOAD = {
+    "age": 49, "sex": 0, "ChestPainType": 2, "RestingBp": 160.0,
+    "Cholesterol": 180.0, "FastingBS": 0, "RestingECG": 0, "MaxHR": 156,
+    "ExerciseAngina": 0, "Oldpeak": 1.0, "ST_Slope": 1,
+}
+
+
+def train_model(seed):
+    """Fit a forest on noisy labels around the payload, varying age and cholesterol"""
+    rng = np.random.default_rng(seed)
+    X = np.tile(predict.build_features(predict.PredictionRequest(**PAYLOAD)), (1000, 1))
+    X[:, predict.EXPECTED_FEATURES.index('Age')] = rng.integers(20, 121, 1000)
+    X[:, predict.EXPECTED_FEATURES.index('Cholesterol')] = rng.integers(100, 401, 1000)
+    y = (X[:, 0] + rng.normal(0, 15, 1000) > 70).astype(int)
+    return RandomForestClassifier(n_estimators=100, random_state=seed).fit(X, y)
+
+
+def start_server():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}/predict"
+
+
+def run_block(url):
+    """Send REQUESTS_PER_BLOCK requests from CLIENTS threads and return {percentile: ms}"""
+    def client(count):
+        rng = np.random.default_rng()
+        timings = []
+        with requests.Session() as session:
+            for _ in range(count):
+                # Vary the inputs so the shadow agreement rate is meaningful
+                payload = dict(PAYLOAD, age=int(rng.integers(20, 121)),
+                               Cholesterol=float(rng.integers(100, 401)))
+                start = time.perf_counter()
+                session.post(url, json=payload).raise_for_status()
+                timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    with ThreadPoolExecutor(max_workers=CLIENTS) as pool:
+        results = pool.map(client, [REQUESTS_PER_BLOCK // CLIENTS] * CLIENTS)
+    timings = np.array([t for timings in results for t in timings])
+    return {p: float(np.percentile(timings, p)) for p in PERCENTILES}
+
+
+def main():
+    primary = train_model(0)
+    predict.model = primary
+    predict.model_router = ModelRouter(primary)
+    shadow = ShadowEvaluator(train_model(1), sample_rate=1.0, max_pending=REQUESTS_PER_BLOCK)
+    server, thread, url = start_server()
+
+    modes = {"baseline": None, "shadow": shadow}
+    blocks = {name: [] for name in modes}
+
+    # Warm up both paths, including the shadow worker process
+    for evaluator in modes.values():
+        predict.shadow = evaluator
+        run_block(url)
+    shadow.wait()
+
+    for round_ in range(ROUNDS):
+        order = list(modes) if round_ % 2 == 0 else list(reversed(modes))
+        for name in order:
+            predict.shadow = modes[name]
+            blocks[name].append(run_block(url))
+            shadow.wait()
+
+    server.should_exit = True
+    thread.join()
+    shadow.close()
+
+    print(f"{ROUNDS} rounds x {REQUESTS_PER_BLOCK} requests, {CLIENTS} concurrent clients")
+    print("per-round percentiles in ms: median over rounds [min - max]")
+    print(f"{'mode':<10}" + "".join(f"{f'p{p}':>24}" for p in PERCENTILES))
+    for name, rounds in blocks.items():
+        cells = []
+        for p in PERCENTILES:
+            values = [block[p] for block in rounds]
+            cells.append(f"{statistics.median(values):.2f} [{min(values):.2f} - {max(values):.2f}]")
+        print(f"{name:<10}" + "".join(f"{cell:>24}" for cell in cells))
+
+    for p in PERCENTILES:
+        baseline = [block[p] for block in blocks["baseline"]]
+        shadowed = [block[p] for block in blocks["shadow"]]
+        overhead = statistics.median(shadowed) - statistics.median(baseline)
+        noise = statistics.stdev(baseline)
+        verdict = "within" if abs(overhead) <= 2 * noise else "OUTSIDE"
+        print(f"p{p} shadow overhead: {overhead:+.3f} ms, baseline noise (1 sd): {noise:.3f} ms"
+              f" -> {verdict} 2 sd")
+    print(f"shadow stats: {shadow.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
-from fastapi import FastAPI
+import math
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from src.api.routers import predict
 
 app = FastAPI(
@@ -19,6 +23,22 @@ app.add_middleware(
 
 app.include_router(predict.router)
 
+def _replace_non_finite(value):
+    """Recursively stringify NaN/Infinity so the value can be sent as strict JSON"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: _replace_non_finite(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace_non_finite(item) for item in value]
+    return value
+
+# NaN/Infinity inputs are rejected by validation but can't be echoed back in strict JSON
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    errors = _replace_non_finite(jsonable_encoder(exc.errors()))
+    return JSONResponse(status_code=422, content={"detail": errors})
+
 @app.get("/")
 async def root():
     return {"status": "healthy", "message": "Heart Disease Prediction API is running"}
\ No newline at end of file
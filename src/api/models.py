@@ -1,18 +1,52 @@
-from pydantic import BaseModel
+from typing import List, Literal, Union
+from pydantic import BaseModel, Field, model_validator
 
 class PredictionRequest(BaseModel):
     age: int
     sex: int
     ChestPainType: int
-    RestingBp: float
-    Cholesterol: float
+    RestingBp: float = Field(allow_inf_nan=False)
+    Cholesterol: float = Field(allow_inf_nan=False)
     FastingBS: int
     RestingECG: int
     MaxHR: int
     ExerciseAngina: int
-    Oldpeak: float
+    Oldpeak: float = Field(allow_inf_nan=False)
     ST_Slope: int
 
 class PredictionResponse(BaseModel):
     heart_disease_risk: int
-    confidence: float = None
\ No newline at end of file
+    confidence: float = None
+    model_version: str = None
+
+# Plausible clinical range for each sweepable field
+SWEEP_BOUNDS = {
+    "age": (0, 120),
+    "RestingBp": (0, 300),
+    "Cholesterol": (0, 1000),
+    "MaxHR": (0, 300),
+    "Oldpeak": (-10, 10),
+}
+
+class SweepParameter(BaseModel):
+    name: Literal["age", "RestingBp", "Cholesterol", "MaxHR", "Oldpeak"]
+    start: float = Field(allow_inf_nan=False)
+    stop: float = Field(allow_inf_nan=False)
+    steps: int = Field(default=20, ge=2, le=100)
+
+    @model_validator(mode="after")
+    def check_bounds(self):
+        low, high = SWEEP_BOUNDS[self.name]
+        for value in (self.start, self.stop):
+            if not low <= value <= high:
+                raise ValueError(f"{self.name} sweep range must lie within [{low}, {high}]")
+        return self
+
+class SweepRequest(BaseModel):
+    base: PredictionRequest
+    parameters: List[SweepParameter] = Field(min_length=1, max_length=2)
+
+class SweepResponse(BaseModel):
+    parameters: List[str]
+    values: List[List[float]]
+    risk: Union[List[float], List[List[float]]]
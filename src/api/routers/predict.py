@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 import numpy as np
 import pickle
 import os
 import logging
-from src.api.models import PredictionRequest, PredictionResponse
+from src.api.models import PredictionRequest, PredictionResponse, SweepRequest, SweepResponse
+from src.utils.model_experiments import PRIMARY_VARIANT, router_from_env, shadow_from_env
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -40,54 +41,132 @@ except Exception as e:
     logger.error(f"Failed to load model on startup: {str(e)}")
     model = None
 
+# A/B variants and the shadow candidate are optional and configured via env vars
+model_router = None
+shadow = None
+if model is not None:
+    try:
+        model_router = router_from_env(model)
+    except Exception as e:
+        logger.error(f"Failed to set up A/B routing: {str(e)}")
+    try:
+        shadow = shadow_from_env()
+    except Exception as e:
+        logger.error(f"Failed to set up shadow model: {str(e)}")
+
+# Request fields that can be swept, mapped to their feature column
+SWEEP_FEATURES = {
+    'age': 'Age',
+    'RestingBp': 'RestingBP',
+    'Cholesterol': 'Cholesterol',
+    'MaxHR': 'MaxHR',
+    'Oldpeak': 'Oldpeak',
+}
+
+def build_features(data: PredictionRequest):
+    """Map a PredictionRequest onto the model's one-hot feature vector"""
+    # Initialize features array
+    features = np.zeros(len(EXPECTED_FEATURES))
+    
+    # Map input data to feature array
+    features[EXPECTED_FEATURES.index('Age')] = data.age
+    features[EXPECTED_FEATURES.index('RestingBP')] = data.RestingBp
+    features[EXPECTED_FEATURES.index('Cholesterol')] = data.Cholesterol
+    features[EXPECTED_FEATURES.index('FastingBS')] = data.FastingBS
+    features[EXPECTED_FEATURES.index('MaxHR')] = data.MaxHR
+    features[EXPECTED_FEATURES.index('Oldpeak')] = data.Oldpeak
+    features[EXPECTED_FEATURES.index('Sex_M')] = 1 if data.sex == 1 else 0
+    features[EXPECTED_FEATURES.index('ExerciseAngina_Y')] = 1 if data.ExerciseAngina == 1 else 0
+    
+    # Map chest pain type
+    if data.ChestPainType == 0:
+        features[EXPECTED_FEATURES.index('ChestPainType_TA')] = 1
+    elif data.ChestPainType == 1:
+        features[EXPECTED_FEATURES.index('ChestPainType_ATA')] = 1
+    elif data.ChestPainType == 2:
+        features[EXPECTED_FEATURES.index('ChestPainType_NAP')] = 1
+        
+    # Map ECG results
+    if data.RestingECG == 0:
+        features[EXPECTED_FEATURES.index('RestingECG_Normal')] = 1
+    elif data.RestingECG == 1:
+        features[EXPECTED_FEATURES.index('RestingECG_ST')] = 1
+        
+    # Map ST slope
+    if data.ST_Slope == 0:
+        features[EXPECTED_FEATURES.index('ST_Slope_Up')] = 1
+    elif data.ST_Slope == 1:
+        features[EXPECTED_FEATURES.index('ST_Slope_Flat')] = 1
+    
+    return features
+
 @router.post("/predict", response_model=PredictionResponse)
-async def predict(data: PredictionRequest):
+async def predict(data: PredictionRequest, background_tasks: BackgroundTasks):
     if model is None:
         raise HTTPException(status_code=500, detail="Model not available")
     
     try:
-        # Initialize features array
-        features = np.zeros(len(EXPECTED_FEATURES))
-        
-        # Map input data to feature array
-        features[EXPECTED_FEATURES.index('Age')] = data.age
-        features[EXPECTED_FEATURES.index('RestingBP')] = data.RestingBp
-        features[EXPECTED_FEATURES.index('Cholesterol')] = data.Cholesterol
-        features[EXPECTED_FEATURES.index('FastingBS')] = data.FastingBS
-        features[EXPECTED_FEATURES.index('MaxHR')] = data.MaxHR
-        features[EXPECTED_FEATURES.index('Oldpeak')] = data.Oldpeak
-        features[EXPECTED_FEATURES.index('Sex_M')] = 1 if data.sex == 1 else 0
-        features[EXPECTED_FEATURES.index('ExerciseAngina_Y')] = 1 if data.ExerciseAngina == 1 else 0
-        
-        # Map chest pain type
-        if data.ChestPainType == 0:
-            features[EXPECTED_FEATURES.index('ChestPainType_TA')] = 1
-        elif data.ChestPainType == 1:
-            features[EXPECTED_FEATURES.index('ChestPainType_ATA')] = 1
-        elif data.ChestPainType == 2:
-            features[EXPECTED_FEATURES.index('ChestPainType_NAP')] = 1
-            
-        # Map ECG results
-        if data.RestingECG == 0:
-            features[EXPECTED_FEATURES.index('RestingECG_Normal')] = 1
-        elif data.RestingECG == 1:
-            features[EXPECTED_FEATURES.index('RestingECG_ST')] = 1
-            
-        # Map ST slope
-        if data.ST_Slope == 0:
-            features[EXPECTED_FEATURES.index('ST_Slope_Up')] = 1
-        elif data.ST_Slope == 1:
-            features[EXPECTED_FEATURES.index('ST_Slope_Flat')] = 1
+        features = build_features(data)
         
         # Make prediction
-        prediction = model.predict(features.reshape(1, -1))
-        result = int(prediction[0])
+        if model_router is not None:
+            variant, result, _ = model_router.predict(features)
+        else:
+            variant, result = PRIMARY_VARIANT, int(model.predict(features.reshape(1, -1))[0])
+        
+        # Shadow scoring runs only after the response has been sent, and only
+        # against the primary model so A/B variants don't skew agreement
+        if shadow is not None and variant == PRIMARY_VARIANT and shadow.should_sample():
+            background_tasks.add_task(shadow.submit, features, result)
         
-        return PredictionResponse(heart_disease_risk=result)
+        return PredictionResponse(heart_disease_risk=result, model_version=variant)
         
     except Exception as e:
         logger.error(f"Prediction error: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Prediction failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+# Plain def so FastAPI runs the grid scoring in its threadpool instead of blocking the event loop
+@router.post("/predict/sweep", response_model=SweepResponse)
+def predict_sweep(request: SweepRequest):
+    if model is None:
+        raise HTTPException(status_code=500, detail="Model not available")
+    
+    names = [param.name for param in request.parameters]
+    if len(set(names)) != len(names):
+        raise HTTPException(status_code=400, detail="Sweep parameters must be distinct")
+    
+    try:
+        axes = [np.linspace(param.start, param.stop, param.steps) for param in request.parameters]
+        grid = np.meshgrid(*axes, indexing='ij')
+        
+        # Repeat the base row once per grid point, then overwrite the swept columns
+        features = np.tile(build_features(request.base), (grid[0].size, 1))
+        for name, values in zip(names, grid):
+            features[:, EXPECTED_FEATURES.index(SWEEP_FEATURES[name])] = values.ravel()
+        
+        # Score the whole grid in a single vectorized call
+        positive = list(model.classes_).index(1)
+        risk = model.predict_proba(features)[:, positive].reshape(grid[0].shape)
+        
+        return SweepResponse(
+            parameters=names,
+            values=[axis.tolist() for axis in axes],
+            risk=risk.tolist()
+        )
+        
+    except Exception as e:
+        logger.error(f"Sweep error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Sweep failed: {str(e)}"
+        )
+
+@router.get("/models/stats")
+async def model_stats():
+    return {
+        "ab": model_router.stats() if model_router is not None else None,
+        "shadow": shadow.stats() if shadow is not None else None,
+    }
\ No newline at end of file
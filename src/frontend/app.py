@@ -7,6 +7,24 @@ import os
 
 API_URL = os.getenv('API_URL', 'https://ai-powered-heart-disease-risk-assessment.onrender.com')
 
+# Input bounds shared by the form fields and the what-if sliders
+INPUT_BOUNDS = {
+    "age": (20, 120),
+    "RestingBp": (80, 200),
+    "Cholesterol": (100, 600),
+    "MaxHR": (60, 220),
+    "Oldpeak": (0.0, 6.0),
+}
+
+# What-if parameters: label -> PredictionRequest field
+SWEEP_PARAMETERS = {
+    "Age (years)": "age",
+    "Resting Blood Pressure (mm Hg)": "RestingBp",
+    "Cholesterol Level (mg/dl)": "Cholesterol",
+    "Maximum Heart Rate": "MaxHR",
+    "ST Depression (Oldpeak)": "Oldpeak",
+}
+
 def get_health_recommendations(data, risk_level):
     recommendations = []
     try:
@@ -345,16 +363,16 @@ with col1:
     st.markdown("### 📋 Personal Information")
     st.info("Basic demographic and physical measurements")
     age = st.number_input("Age (years)", 
-                         min_value=20, 
-                         max_value=120, 
+                         min_value=INPUT_BOUNDS['age'][0], 
+                         max_value=INPUT_BOUNDS['age'][1], 
                          value=40,
                          help="Patient's age in years")
     sex = st.selectbox("Biological Sex",
                       options=["Male", "Female"],
                       help="Patient's biological sex at birth")
     resting_bp = st.number_input("Resting Blood Pressure (mm Hg)", 
-                                min_value=80, 
-                                max_value=200,
+                                min_value=INPUT_BOUNDS['RestingBp'][0], 
+                                max_value=INPUT_BOUNDS['RestingBp'][1],
                                 help="Blood pressure measured while patient is at rest")
 
 # Clinical Measurements Section
@@ -362,15 +380,15 @@ with col2:
     st.markdown("### 🔬 Clinical Measurements")
     st.info("Laboratory and diagnostic test results")
     cholesterol = st.number_input("Cholesterol Level (mg/dl)", 
-                                 min_value=100, 
-                                 max_value=600,
+                                 min_value=INPUT_BOUNDS['Cholesterol'][0], 
+                                 max_value=INPUT_BOUNDS['Cholesterol'][1],
                                  help="Total cholesterol level in blood")
     fasting_bs = st.selectbox("Fasting Blood Sugar > 120 mg/dl", 
                              options=["No (≤120 mg/dl)", "Yes (>120 mg/dl)"],
                              help="Blood sugar measurement after overnight fasting")
     max_hr = st.number_input("Maximum Heart Rate", 
-                            min_value=60, 
-                            max_value=220,
+                            min_value=INPUT_BOUNDS['MaxHR'][0], 
+                            max_value=INPUT_BOUNDS['MaxHR'][1],
                             help="Maximum heart rate achieved during exercise")
 
 # Cardiac Specific Section
@@ -395,8 +413,8 @@ col4, col5 = st.columns(2)
 
 with col4:
     oldpeak = st.number_input("ST Depression (Oldpeak)", 
-                             min_value=0.0, 
-                             max_value=6.0, 
+                             min_value=INPUT_BOUNDS['Oldpeak'][0], 
+                             max_value=INPUT_BOUNDS['Oldpeak'][1], 
                              step=0.1,
                              help="ST depression induced by exercise relative to rest")
 
@@ -408,6 +426,36 @@ with col5:
 # Add a divider
 st.divider()
 
+def build_input_data():
+    """Prepare input data matching predict.py PredictionRequest structure"""
+    return {
+        "age": age,
+        "sex": 1 if sex == "Male" else 0,
+        "ChestPainType": {
+            "Typical Angina": 0,
+            "Atypical Angina": 1,
+            "Non-anginal Pain": 2,
+            "Asymptomatic": 3
+        }[chest_pain_type],
+        "RestingBp": float(resting_bp),
+        "Cholesterol": float(cholesterol),
+        "FastingBS": 1 if fasting_bs == "Yes (>120 mg/dl)" else 0,
+        "RestingECG": {
+            "Normal": 0,
+            "ST-T Wave Abnormality": 1,
+            "Left Ventricular Hypertrophy": 2
+        }[resting_ecg],
+        "MaxHR": max_hr,
+        "ExerciseAngina": 1 if exercise_angina == "Yes" else 0,
+        "Oldpeak": float(oldpeak),
+        "ST_Slope": {
+            "Upsloping": 0,
+            "Flat": 1,
+            "Downsloping": 2
+        }[st_slope]
+    }
+
+
 # Prediction Button
 if st.button("📋 Generate Risk Assessment"):
     try:
@@ -416,33 +464,7 @@ if st.button("📋 Generate Risk Assessment"):
             st.error("❌ Please fill in all required fields.")
             st.stop()
 
-        # Prepare input data matching predict.py PredictionRequest structure
-        input_data = {
-            "age": age,
-            "sex": 1 if sex == "Male" else 0,
-            "ChestPainType": {
-                "Typical Angina": 0,
-                "Atypical Angina": 1,
-                "Non-anginal Pain": 2,
-                "Asymptomatic": 3
-            }[chest_pain_type],
-            "RestingBp": float(resting_bp),
-            "Cholesterol": float(cholesterol),
-            "FastingBS": 1 if fasting_bs == "Yes (>120 mg/dl)" else 0,
-            "RestingECG": {
-                "Normal": 0,
-                "ST-T Wave Abnormality": 1,
-                "Left Ventricular Hypertrophy": 2
-            }[resting_ecg],
-            "MaxHR": max_hr,
-            "ExerciseAngina": 1 if exercise_angina == "Yes" else 0,
-            "Oldpeak": float(oldpeak),
-            "ST_Slope": {
-                "Upsloping": 0,
-                "Flat": 1,
-                "Downsloping": 2
-            }[st_slope]
-        }
+        input_data = build_input_data()
 
         with st.spinner('🔄 Analyzing patient data...'):
             try:
@@ -520,6 +542,90 @@ if st.button("📋 Generate Risk Assessment"):
     except Exception as e:
         st.error(f"❌ An unexpected error occurred: {str(e)}")
 
+# What-if Analysis
+st.markdown("---")
+st.markdown("### 📈 What-if Analysis")
+st.info("See how the predicted risk changes across a range of one or two values, keeping all other fields as entered above.")
+
+selected_params = st.multiselect("Parameters to vary",
+    options=list(SWEEP_PARAMETERS),
+    max_selections=2,
+    help="Pick one parameter for a risk curve or two for a risk heatmap")
+
+sweep_ranges = {}
+for label in selected_params:
+    min_value, max_value = INPUT_BOUNDS[SWEEP_PARAMETERS[label]]
+    sweep_ranges[label] = st.slider(f"{label} range",
+                                    min_value=min_value,
+                                    max_value=max_value,
+                                    value=(min_value, max_value))
+
+if selected_params and st.button("📈 Run What-if Analysis"):
+    steps = 100 if len(selected_params) == 1 else 50
+    sweep_request = {
+        "base": build_input_data(),
+        "parameters": [
+            {
+                "name": SWEEP_PARAMETERS[label],
+                "start": float(sweep_ranges[label][0]),
+                "stop": float(sweep_ranges[label][1]),
+                "steps": steps
+            }
+            for label in selected_params
+        ]
+    }
+    try:
+        with st.spinner('🔄 Computing risk curve...'):
+            response = requests.post(f"{API_URL}/predict/sweep", json=sweep_request, timeout=30)
+        if response.status_code == 200:
+            sweep = response.json()
+            if len(selected_params) == 1:
+                label = selected_params[0]
+                points = [{label: x, "Risk": r} for x, r in zip(sweep['values'][0], sweep['risk'])]
+                st.vega_lite_chart(points, {
+                    "mark": "line",
+                    "encoding": {
+                        "x": {"field": label, "type": "quantitative"},
+                        "y": {"field": "Risk", "type": "quantitative", "scale": {"domain": [0, 1]}}
+                    }
+                }, use_container_width=True)
+            else:
+                x_label, y_label = selected_params
+                x_values, y_values = sweep['values']
+                # One rect per grid point, spanning half a grid step either side
+                x_half = (x_values[1] - x_values[0]) / 2 or 0.5
+                y_half = (y_values[1] - y_values[0]) / 2 or 0.5
+                points = [
+                    {"x": x - x_half, "x2": x + x_half, "y": y - y_half, "y2": y + y_half,
+                     x_label: x, y_label: y, "Risk": r}
+                    for x, row in zip(x_values, sweep['risk'])
+                    for y, r in zip(y_values, row)
+                ]
+                st.vega_lite_chart(points, {
+                    "mark": "rect",
+                    "encoding": {
+                        "x": {"field": "x", "type": "quantitative", "title": x_label},
+                        "x2": {"field": "x2"},
+                        "y": {"field": "y", "type": "quantitative", "title": y_label},
+                        "y2": {"field": "y2"},
+                        "color": {"field": "Risk", "type": "quantitative",
+                                  "scale": {"domain": [0, 1], "scheme": "redyellowgreen", "reverse": True}},
+                        "tooltip": [
+                            {"field": x_label, "type": "quantitative"},
+                            {"field": y_label, "type": "quantitative"},
+                            {"field": "Risk", "type": "quantitative", "format": ".2f"}
+                        ]
+                    }
+                }, use_container_width=True)
+        else:
+            st.error(f"❌ What-if analysis failed (Status: {response.status_code})")
+            if response.text:
+                st.error(f"Details: {response.text}")
+    except requests.exceptions.Timeout:
+        st.error("⏰ Request timed out. Please try again.")
+    except requests.exceptions.ConnectionError:
+        st.error("🔌 Unable to connect to the prediction service. Please try again later.")
+
 # Disclaimer
 st.markdown("---")
 st.warning("""
@@ -0,0 +1,263 @@
+import os
+import random
+import threading
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.utils.model_utils import load_model
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_VARIANT = "primary"
+
+
+class LatencyStats:
+    """Thread-safe running latency counters for one model.
+
+    Wall time includes any time spent waiting for the CPU, which dominates for
+    the niced shadow worker on a busy server. CPU time is the thread's own
+    compute time and is the figure to compare across models.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.wall_total_ms = 0.0
+        self.wall_max_ms = 0.0
+        self.cpu_total_ms = 0.0
+        self.cpu_max_ms = 0.0
+
+    def record(self, wall_ms, cpu_ms):
+        with self._lock:
+            self.count += 1
+            self.wall_total_ms += wall_ms
+            self.wall_max_ms = max(self.wall_max_ms, wall_ms)
+            self.cpu_total_ms += cpu_ms
+            self.cpu_max_ms = max(self.cpu_max_ms, cpu_ms)
+
+    def summary(self):
+        with self._lock:
+            count = self.count or 1
+            return {
+                "count": self.count,
+                "cpu_mean_ms": round(self.cpu_total_ms / count, 3),
+                "cpu_max_ms": round(self.cpu_max_ms, 3),
+                "wall_mean_ms": round(self.wall_total_ms / count, 3),
+                "wall_max_ms": round(self.wall_max_ms, 3),
+            }
+
+
+def timed_predict(model, features):
+    """Run model.predict on a single feature row and return (label, wall_ms, cpu_ms)"""
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    prediction = model.predict(features.reshape(1, -1))
+    cpu_ms = (time.thread_time() - cpu_start) * 1000
+    wall_ms = (time.perf_counter() - wall_start) * 1000
+    return int(prediction[0]), wall_ms, cpu_ms
+
+
+class ModelRouter:
+    """Weighted A/B routing between the primary model and optional variants"""
+
+    def __init__(self, primary, variants=None, weights=None):
+        self.models = {PRIMARY_VARIANT: primary}
+        self.models.update(variants or {})
+        weights = weights or {}
+        unknown = set(weights) - set(self.models)
+        if unknown:
+            raise ValueError(f"A/B weights given for unknown models: {sorted(unknown)}")
+        self._names = list(self.models)
+        self._weights = [float(weights.get(name, 1.0 if name == PRIMARY_VARIANT else 0.0))
+                         for name in self._names]
+        if any(w < 0 for w in self._weights) or sum(self._weights) <= 0:
+            raise ValueError(f"Invalid A/B weights: {weights}")
+        self.latency = {name: LatencyStats() for name in self._names}
+
+    @property
+    def primary(self):
+        return self.models[PRIMARY_VARIANT]
+
+    def choose(self):
+        """Pick a variant name according to the configured weights"""
+        if len(self._names) == 1:
+            return PRIMARY_VARIANT
+        return random.choices(self._names, weights=self._weights)[0]
+
+    def predict(self, features):
+        """Route a single feature row, returning (variant, label, wall_ms)"""
+        variant = self.choose()
+        result, wall_ms, cpu_ms = timed_predict(self.models[variant], features)
+        self.latency[variant].record(wall_ms, cpu_ms)
+        return variant, result, wall_ms
+
+    def stats(self):
+        return {
+            name: {"weight": weight, **self.latency[name].summary()}
+            for name, weight in zip(self._names, self._weights)
+        }
+
+
+_shadow_model = None
+
+
+def _init_shadow_worker(model):
+    """Load the shadow model into the worker process at the lowest CPU priority"""
+    global _shadow_model
+    _shadow_model = model
+    if hasattr(os, "nice"):
+        os.nice(19)
+
+
+def _shadow_predict(features):
+    return timed_predict(_shadow_model, features)
+
+
+class ShadowEvaluator:
+    """Score a sample of requests with a candidate model off the request path.
+
+    ``submit`` is meant to be scheduled as a FastAPI background task so it only
+    runs once the response has been sent. The shadow prediction itself happens
+    in a separate, niced worker process so it neither holds the GIL nor takes
+    CPU away from primary predictions. Work is dropped rather than queued once
+    ``max_pending`` jobs are outstanding so a slow candidate cannot build up an
+    unbounded backlog. If the worker process dies it is restarted up to
+    ``max_restarts`` times, after which shadow mode is disabled.
+    """
+
+    def __init__(self, model, sample_rate=0.1, max_pending=100, max_restarts=3):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"Shadow sample rate must be between 0 and 1, got {sample_rate}")
+        self.model = model
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.latency = LatencyStats()
+        self._executor = self._new_executor()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.compared = 0
+        self.agreed = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=1, initializer=_init_shadow_worker, initargs=(self.model,)
+        )
+
+    def _restart_executor(self, broken):
+        """Replace a broken worker pool, or disable shadow mode once restarts run out"""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            if self.restarts >= self.max_restarts:
+                logger.error("Shadow worker keeps crashing, disabling shadow mode")
+                self.sample_rate = 0.0
+                self._executor = None
+            else:
+                self.restarts += 1
+                logger.error(f"Shadow worker died, restarting it ({self.restarts}/{self.max_restarts})")
+                self._executor = self._new_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def should_sample(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def submit(self, features, primary_result):
+        with self._lock:
+            if self._executor is None:
+                return
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending += 1
+            executor = self._executor
+        try:
+            future = executor.submit(_shadow_predict, features)
+        except Exception as e:
+            logger.error(f"Shadow submit error: {str(e)}")
+            self._fail(e, executor)
+            return
+        future.add_done_callback(lambda f: self._record(f, executor, primary_result))
+
+    def _fail(self, error, executor):
+        """Count a failed shadow prediction, restarting the worker first if it died"""
+        if isinstance(error, BrokenProcessPool):
+            self._restart_executor(executor)
+        with self._lock:
+            self.errors += 1
+            self._pending -= 1
+
+    def _record(self, future, executor, primary_result):
+        try:
+            result, wall_ms, cpu_ms = future.result()
+        except Exception as e:
+            logger.error(f"Shadow prediction error: {str(e)}")
+            self._fail(e, executor)
+            return
+        self.latency.record(wall_ms, cpu_ms)
+        with self._lock:
+            self._pending -= 1
+            self.compared += 1
+            if result == primary_result:
+                self.agreed += 1
+
+    def wait(self):
+        """Block until all submitted shadow predictions have finished"""
+        while True:
+            with self._lock:
+                if self._pending == 0:
+                    return
+            time.sleep(0.01)
+
+    def close(self):
+        """Shut down the worker process"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self):
+        with self._lock:
+            agreement = self.agreed / self.compared if self.compared else None
+            return {
+                "sample_rate": self.sample_rate,
+                "compared": self.compared,
+                "agreement_rate": agreement,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "restarts": self.restarts,
+                "latency": self.latency.summary(),
+            }
+
+
+def _parse_mapping(value):
+    """Parse 'name=value,name=value' into a dict"""
+    mapping = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, sep, val = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected name=value, got '{item}'")
+        mapping[name.strip()] = val.strip()
+    return mapping
+
+
+def router_from_env(primary):
+    """Build a ModelRouter from AB_MODELS ('name=path,...') and AB_WEIGHTS ('name=weight,...')"""
+    paths = _parse_mapping(os.getenv("AB_MODELS", ""))
+    weights = {name: float(w) for name, w in _parse_mapping(os.getenv("AB_WEIGHTS", "")).items()}
+    variants = {name: load_model(path) for name, path in paths.items()}
+    return ModelRouter(primary, variants, weights)
+
+
+def shadow_from_env():
+    """Build a ShadowEvaluator from SHADOW_MODEL_PATH and SHADOW_SAMPLE_RATE, or None"""
+    path = os.getenv("SHADOW_MODEL_PATH")
+    if not path:
+        return None
+    sample_rate = float(os.getenv("SHADOW_SAMPLE_RATE", "0.1"))
+    return ShadowEvaluator(load_model(path), sample_rate=sample_rate)
@@ -0,0 +1,142 @@
+import os
+import random
+import signal
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.utils.model_experiments import (
+    PRIMARY_VARIANT,
+    ModelRouter,
+    ShadowEvaluator,
+    router_from_env,
+)
+
+
+@pytest.fixture(scope="module")
+def features():
+    rng = np.random.default_rng(0)
+    return rng.random((50, 15))
+
+
+@pytest.fixture(scope="module")
+def model(features):
+    y = (features[:, 0] > 0.5).astype(int)
+    return RandomForestClassifier(n_estimators=5, random_state=0).fit(features, y)
+
+
+@pytest.fixture
+def shadow(model):
+    evaluator = ShadowEvaluator(model, sample_rate=1.0, max_restarts=1)
+    yield evaluator
+    evaluator.close()
+
+
+def kill_worker(evaluator):
+    for pid in list(evaluator._executor._processes):
+        os.kill(pid, signal.SIGKILL)
+
+
+def test_router_defaults_to_primary(model, features):
+    router = ModelRouter(model)
+    variant, result, _ = router.predict(features[0])
+    assert variant == PRIMARY_VARIANT
+    assert result == int(model.predict(features[:1])[0])
+    assert router.stats()[PRIMARY_VARIANT]["count"] == 1
+
+
+def test_router_variants_without_weight_get_no_traffic(model, features):
+    router = ModelRouter(model, {"v2": model})
+    assert {router.predict(row)[0] for row in features} == {PRIMARY_VARIANT}
+
+
+def test_router_follows_weights(model):
+    random.seed(0)
+    router = ModelRouter(model, {"v2": model}, {"primary": 0.8, "v2": 0.2})
+    choices = [router.choose() for _ in range(5000)]
+    assert 0.17 < choices.count("v2") / len(choices) < 0.23
+
+
+@pytest.mark.parametrize("weights", [
+    {"primary": 1, "v3": 1},
+    {"primary": -1, "v2": 1},
+    {"primary": 0, "v2": 0},
+])
+def test_router_rejects_invalid_weights(model, weights):
+    with pytest.raises(ValueError):
+        ModelRouter(model, {"v2": model}, weights)
+
+
+def test_router_from_env_rejects_typo_in_weights(model, monkeypatch):
+    monkeypatch.setenv("AB_MODELS", "")
+    monkeypatch.setenv("AB_WEIGHTS", "primary=0.9,V2=0.1")
+    with pytest.raises(ValueError):
+        router_from_env(model)
+
+
+def test_shadow_rejects_invalid_sample_rate(model):
+    with pytest.raises(ValueError):
+        ShadowEvaluator(model, sample_rate=1.5)
+
+
+def test_shadow_counts_agreement(shadow, model, features):
+    expected = model.predict(features[:4])
+    for row, label in zip(features[:2], expected[:2]):
+        shadow.submit(row, int(label))
+    for row, label in zip(features[2:4], expected[2:4]):
+        shadow.submit(row, 1 - int(label))
+    shadow.wait()
+
+    stats = shadow.stats()
+    assert stats["compared"] == 4
+    assert stats["agreement_rate"] == 0.5
+    assert stats["latency"]["count"] == 4
+    assert shadow._pending == 0
+
+
+def test_shadow_drops_when_backlog_is_full(model, features):
+    evaluator = ShadowEvaluator(model, sample_rate=1.0, max_pending=0)
+    try:
+        evaluator.submit(features[0], 0)
+        evaluator.wait()
+        assert evaluator.stats()["dropped"] == 1
+        assert evaluator.stats()["compared"] == 0
+    finally:
+        evaluator.close()
+
+
+def test_shadow_restarts_dead_worker(shadow, features):
+    shadow.submit(features[0], 0)
+    shadow.wait()
+    kill_worker(shadow)
+
+    shadow.submit(features[1], 0)
+    shadow.wait()
+    assert shadow.restarts == 1
+    assert shadow.stats()["errors"] == 1
+    assert shadow._pending == 0
+
+    shadow.submit(features[2], 0)
+    shadow.wait()
+    assert shadow.stats()["compared"] == 2
+    assert shadow.should_sample()
+
+
+def test_shadow_disables_itself_after_max_restarts(shadow, features):
+    # max_restarts=1: the first crash restarts the worker, the second disables shadow mode
+    for _ in range(2):
+        shadow.submit(features[0], 0)
+        shadow.wait()
+        kill_worker(shadow)
+        shadow.submit(features[1], 0)
+        shadow.wait()
+
+    assert shadow.restarts == 1
+    assert shadow.sample_rate == 0.0
+    assert not shadow.should_sample()
+
+    # A disabled evaluator ignores submissions without leaking pending slots
+    shadow.submit(features[2], 0)
+    shadow.wait()
+    assert shadow._pending == 0
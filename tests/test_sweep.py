@@ -0,0 +1,113 @@
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.routers import predict
+
+BASE = {
+    "age": 49, "sex": 0, "ChestPainType": 2, "RestingBp": 160.0,
+    "Cholesterol": 180.0, "FastingBS": 0, "RestingECG": 0, "MaxHR": 156,
+    "ExerciseAngina": 0, "Oldpeak": 1.0, "ST_Slope": 1,
+}
+
+AGE = predict.EXPECTED_FEATURES.index('Age')
+CHOLESTEROL = predict.EXPECTED_FEATURES.index('Cholesterol')
+
+
+class StubModel:
+    """Risk encodes age and cholesterol so each grid cell can be traced back to its inputs"""
+    classes_ = np.array([0, 1])
+
+    def predict_proba(self, X):
+        risk = X[:, AGE] / 1000 + X[:, CHOLESTEROL] / 1e6
+        return np.column_stack([1 - risk, risk])
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(predict, "model", StubModel())
+    return TestClient(app)
+
+
+def sweep(client, *parameters):
+    return client.post("/predict/sweep", json={"base": BASE, "parameters": list(parameters)})
+
+
+def test_one_parameter_sweep(client):
+    response = sweep(client, {"name": "age", "start": 20, "stop": 80, "steps": 7})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["parameters"] == ["age"]
+    assert body["values"] == [[20, 30, 40, 50, 60, 70, 80]]
+    expected = [age / 1000 + BASE["Cholesterol"] / 1e6 for age in body["values"][0]]
+    assert body["risk"] == pytest.approx(expected)
+
+
+def test_two_parameter_grid_orientation(client):
+    response = sweep(
+        client,
+        {"name": "age", "start": 30, "stop": 70, "steps": 5},
+        {"name": "Cholesterol", "start": 100, "stop": 400, "steps": 4},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    ages, cholesterols = body["values"]
+    assert len(body["risk"]) == len(ages) == 5
+    assert all(len(row) == len(cholesterols) == 4 for row in body["risk"])
+    for i, age in enumerate(ages):
+        for j, cholesterol in enumerate(cholesterols):
+            assert body["risk"][i][j] == pytest.approx(age / 1000 + cholesterol / 1e6)
+
+
+def test_duplicate_parameters_rejected(client):
+    response = sweep(
+        client,
+        {"name": "age", "start": 30, "stop": 70},
+        {"name": "age", "start": 40, "stop": 50},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("steps, status", [(1, 422), (2, 200), (100, 200), (101, 422)])
+def test_steps_limits(client, steps, status):
+    response = sweep(client, {"name": "age", "start": 30, "stop": 70, "steps": steps})
+    assert response.status_code == status
+
+
+@pytest.mark.parametrize("parameter", [
+    {"name": "sex", "start": 0, "stop": 1},
+    {"name": "age", "start": 1e308, "stop": -1e308},
+    {"name": "Oldpeak", "start": -20, "stop": 2},
+])
+def test_invalid_parameters_rejected(client, parameter):
+    assert sweep(client, parameter).status_code == 422
+
+
+@pytest.mark.parametrize("body", [
+    '{"base": %s, "parameters": [{"name": "age", "start": NaN, "stop": 80}]}',
+    '{"base": %s, "parameters": [{"name": "age", "start": NaN}]}',
+    '{"base": %s, "parameters": [{"name": "age", "start": Infinity, "stop": 80}]}',
+])
+def test_non_finite_range_rejected(client, body):
+    response = client.post("/predict/sweep", content=body % json.dumps(BASE),
+                           headers={"content-type": "application/json"})
+    assert response.status_code == 422
+
+
+def test_non_finite_base_rejected(client):
+    base = json.dumps(BASE).replace("180.0", "NaN")
+    response = client.post(
+        "/predict/sweep",
+        content='{"base": %s, "parameters": [{"name": "age", "start": 30, "stop": 70}]}' % base,
+        headers={"content-type": "application/json"},
+    )
+    assert response.status_code == 422
+
+
+def test_sweep_without_model(monkeypatch):
+    monkeypatch.setattr(predict, "model", None)
+    response = sweep(TestClient(app), {"name": "age", "start": 30, "stop": 70})
+    assert response.status_code == 500